@@ -8,15 +8,27 @@ import base64
 import io
 import signal
 import asyncio
+import functools
+import threading
+from typing import Any, Callable
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+# 强制使用无界面的Agg后端，避免加载Tk/Qt等GUI工具包
+matplotlib.use('Agg', force=True)
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 0.5
+matplotlib.rcParams['agg.path.chunksize'] = 10000
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image, ImageDraw
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
 
+# 日志级别默认INFO，可通过 LOG_LEVEL 环境变量调整；输出到stderr，stdout留给MCP的stdio传输
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
+    handlers=[logging.StreamHandler(sys.stderr)]
 )
 logger = logging.getLogger("geometry-service")
 
@@ -26,13 +38,168 @@ logger.info(f"脚本路径: {__file__}")
 
 app = Server("geometry-service")
 
+# 渲染结果缓存开关，设置 GEOM_CACHE=0 可关闭
+GEOM_CACHE = os.getenv("GEOM_CACHE", "1") != "0"
+
+def _canonical(value):
+    """将参数转换为可哈希的规范形式（列表转元组，浮点数保留12位有效数字）"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, float):
+        return float(f"{value:.12g}")
+    return value
+
+class _RenderKey:
+    """渲染缓存键：按规范形式比较和哈希，同时保留原始参数供绘图使用"""
+    __slots__ = ("args", "canonical")
+
+    def __init__(self, args):
+        self.args = args
+        self.canonical = _canonical(args)
+
+    def __hash__(self):
+        return hash(self.canonical)
+
+    def __eq__(self, other):
+        return isinstance(other, _RenderKey) and self.canonical == other.canonical
+
+@functools.lru_cache(maxsize=512)
+def _cached_render(fn, key):
+    return fn(*key.args)
+
+def _render(fn, *args):
+    """调用绘图函数，相同参数直接返回缓存的base64图片；规范形式只用于缓存键，绘图使用原始参数"""
+    if not GEOM_CACHE:
+        return fn(*args)
+    return _cached_render(fn, _RenderKey(args))
+
+# 复用同一个Figure和Agg画布，避免每次请求重新创建Figure、Axes和渲染器
+_FIG = Figure(figsize=(6, 6))
+_CANVAS = FigureCanvasAgg(_FIG)
+_AX = _FIG.add_subplot(111)
+_AX.set_aspect('equal', adjustable='datalim')
+_AX.grid(True, alpha=0.3)
+_LINE, = _AX.plot([], [])
+# 共享画布不是线程安全的，绘制期间需要加锁
+_FIG_LOCK = threading.Lock()
+# 图片随响应内联返回、即用即弃，使用最低的DEFLATE压缩等级换取编码速度
+PNG_COMPRESS_LEVEL = 1
+
+_PNG_URI_PREFIX = b'data:image/png;base64,'
+_SVG_URI_PREFIX = b'data:image/svg+xml;base64,'
+
+def _data_uri(prefix, raw):
+    """把原始图片字节编码为data URI，前缀和base64内容一次拼接、一次解码"""
+    return b''.join((prefix, base64.b64encode(raw))).decode('ascii')
+
 def save_figure_to_base64():
     buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
-    img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-    return img_base64
+    _CANVAS.print_png(buf, pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
+    return _data_uri(_PNG_URI_PREFIX, buf.getbuffer())
+
+# 基本图形直接用Pillow光栅化，不经过Matplotlib的布局、刻度和字体渲染
+CANVAS_SIZE = 400
+CANVAS_MARGIN = 20
+SHAPE_COLOR = (31, 119, 180, 255)
+# 背景网格开关，设置 GEOM_GRID=0 可关闭
+GEOM_GRID = os.getenv("GEOM_GRID", "1") != "0"
+
+@functools.lru_cache(maxsize=1)
+def _grid_overlay():
+    """预渲染的背景网格（每50像素一条线），在每张图片上直接叠加"""
+    img = Image.new('RGBA', (CANVAS_SIZE, CANVAS_SIZE), (255, 255, 255, 0))
+    d = ImageDraw.Draw(img)
+    for i in range(0, CANVAS_SIZE + 1, 50):
+        d.line([(i, 0), (i, CANVAS_SIZE)], fill=(128, 128, 128, 77))
+        d.line([(0, i), (CANVAS_SIZE, i)], fill=(128, 128, 128, 77))
+    return img
+
+def _pixel_transform(xmin, ymin, xmax, ymax):
+    """返回将数据坐标等比例映射为像素坐标的函数（图形居中，y轴向上）"""
+    span = max(xmax - xmin, ymax - ymin) or 1.0
+    scale = (CANVAS_SIZE - 2 * CANVAS_MARGIN) / span
+    ox = (CANVAS_SIZE - (xmax - xmin) * scale) / 2
+    oy = (CANVAS_SIZE - (ymax - ymin) * scale) / 2
+
+    def to_px(x, y):
+        return (ox + (x - xmin) * scale, CANVAS_SIZE - oy - (y - ymin) * scale)
+    return to_px
+
+def _raster_to_base64(draw_fn):
+    """新建透明画布，调用draw_fn绘制后编码为PNG的base64 data URI"""
+    img = Image.new('RGBA', (CANVAS_SIZE, CANVAS_SIZE), (255, 255, 255, 0))
+    draw_fn(ImageDraw.Draw(img))
+    if GEOM_GRID:
+        img = Image.alpha_composite(_grid_overlay(), img)
+    buf = io.BytesIO()
+    img.save(buf, 'PNG', optimize=False, compress_level=PNG_COMPRESS_LEVEL)
+    return _data_uri(_PNG_URI_PREFIX, buf.getbuffer())
+
+def _raster_polyline(pts, closed=False):
+    """绘制经过各顶点的折线（closed为True时首尾相连），并在顶点处画圆点"""
+    to_px = _pixel_transform(pts[:,0].min(), pts[:,1].min(), pts[:,0].max(), pts[:,1].max())
+    px = [to_px(x, y) for x, y in pts]
+
+    def draw(d):
+        if closed:
+            d.polygon(px, outline=SHAPE_COLOR, width=2)
+        else:
+            d.line(px, fill=SHAPE_COLOR, width=2, joint='curve')
+        for x, y in px:
+            d.ellipse([x - 3, y - 3, x + 3, y + 3], fill=SHAPE_COLOR)
+    return _raster_to_base64(draw)
+
+def _raster_ellipse(center_x, center_y, rx, ry):
+    """绘制以(center_x, center_y)为中心、半轴为rx和ry的椭圆"""
+    rx, ry = abs(rx), abs(ry)
+    to_px = _pixel_transform(center_x - rx, center_y - ry, center_x + rx, center_y + ry)
+    bbox = [*to_px(center_x - rx, center_y + ry), *to_px(center_x + rx, center_y - ry)]
+    return _raster_to_base64(lambda d: d.ellipse(bbox, outline=SHAPE_COLOR, width=2))
+
+# 矢量输出：直接拼接SVG元素，不需要逐像素光栅化和PNG压缩
+_FORMAT_SCHEMA = {"type": "string", "enum": ["svg", "png"], "description": "图片格式，默认svg", "default": "svg"}
+
+def _svg_shape(elem, xmin, ymin, xmax, ymax):
+    """把SVG图形元素包装为完整的SVG文档并返回base64的data URI，y轴向上"""
+    span = max(xmax - xmin, ymax - ymin) or 1.0
+    m = span * CANVAS_MARGIN / (CANVAS_SIZE - 2 * CANVAS_MARGIN)
+    view_box = f"{xmin - m:.6g} {-ymax - m:.6g} {xmax - xmin + 2 * m:.6g} {ymax - ymin + 2 * m:.6g}"
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{CANVAS_SIZE}" height="{CANVAS_SIZE}" viewBox="{view_box}">'
+        f'<g fill="none" stroke="#1f77b4" stroke-width="2">{elem}</g></svg>'
+    )
+    return _data_uri(_SVG_URI_PREFIX, svg.encode('utf-8'))
+
+def _svg_polyline(pts, closed=False):
+    """生成经过各顶点的折线（closed为True时首尾相连），并在顶点处画圆点"""
+    xmin, ymin = pts.min(axis=0)
+    xmax, ymax = pts.max(axis=0)
+    r = (max(xmax - xmin, ymax - ymin) or 1.0) * 3 / (CANVAS_SIZE - 2 * CANVAS_MARGIN)
+    coords = " ".join(f"{x:.6g},{-y:.6g}" for x, y in pts)
+    dots = "".join(f'<circle cx="{x:.6g}" cy="{-y:.6g}" r="{r:.6g}" fill="#1f77b4" stroke="none"/>' for x, y in pts)
+    tag = "polygon" if closed else "polyline"
+    elem = f'<{tag} points="{coords}" vector-effect="non-scaling-stroke"/>{dots}'
+    return _svg_shape(elem, xmin, ymin, xmax, ymax)
+
+def _svg_ellipse(center_x, center_y, rx, ry):
+    """生成以(center_x, center_y)为中心、半轴为rx和ry的椭圆"""
+    rx, ry = abs(rx), abs(ry)
+    elem = f'<ellipse cx="{center_x:.6g}" cy="{-center_y:.6g}" rx="{rx:.6g}" ry="{ry:.6g}" vector-effect="non-scaling-stroke"/>'
+    return _svg_shape(elem, center_x - rx, center_y - ry, center_x + rx, center_y + ry)
+
+def _polyline(pts, fmt, closed=False):
+    if fmt == "svg":
+        return _svg_polyline(pts, closed)
+    if fmt == "png":
+        return _raster_polyline(pts, closed)
+    raise ValueError(f"不支持的图片格式: {fmt}")
+
+def _ellipse(center_x, center_y, rx, ry, fmt):
+    if fmt == "svg":
+        return _svg_ellipse(center_x, center_y, rx, ry)
+    if fmt == "png":
+        return _raster_ellipse(center_x, center_y, rx, ry)
+    raise ValueError(f"不支持的图片格式: {fmt}")
 
 def generate_circle_js(center_x, center_y, radius):
     """生成绘制圆形的JavaScript代码"""
@@ -76,300 +243,271 @@ for(let i = 0; i <= 400; i += 50) {{
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-    logger.info(f"调用工具: {name}, 参数: {arguments}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("调用工具: %s, 参数: %s", name, arguments)
 
     try:
+        handler = HANDLERS.get(name)
+        if handler is None:
+            return [TextContent(type="text", text=f"未知工具: {name}")]
+
+        fn, names, defaults = handler
+        if any(d is _REQUIRED and n not in arguments for n, d in zip(names, defaults)):
+            return [TextContent(type="text", text="缺少必要参数")]
+        args = [arguments.get(n, d) for n, d in zip(names, defaults)]
+
+        # 生成图片，直接得到data URI
+        uri = _render(fn, *args)
+
         if name == "draw_circle":
-            # 验证参数
-            if not all(key in arguments for key in ["center_x", "center_y", "radius"]):
-                return [TextContent(type="text", text="缺少必要参数")]
-            
-            # 生成图片并获取base64编码
-            img_data = draw_circle(
-                arguments["center_x"],
-                arguments["center_y"],
-                arguments["radius"]
-            )
-            
             # 返回markdown格式的图片
-            return [TextContent(
-                type="text",
-                text=f"![circle](data:image/png;base64,{img_data})"
-            )]
-        elif name == "draw_line":
-            img = draw_line(arguments.get("x1"), arguments.get("y1"), arguments.get("x2"), arguments.get("y2"))
-            return [TextContent(type="text", text=f"data:image/png;base64,{img}")]
-        elif name == "draw_triangle":
-            img = draw_triangle(arguments.get("points"))
-            return [TextContent(type="text", text=f"data:image/png;base64,{img}")]
-        elif name == "draw_rectangle":
-            img = draw_rectangle(arguments.get("x"), arguments.get("y"), arguments.get("width"), arguments.get("height"))
-            return [TextContent(type="text", text=f"data:image/png;base64,{img}")]
-        elif name == "draw_polygon":
-            img = draw_polygon(arguments.get("points"))
-            return [TextContent(type="text", text=f"data:image/png;base64,{img}")]
-        elif name == "draw_trapezoid":
-            img = draw_trapezoid(arguments.get("points"))
-            return [TextContent(type="text", text=f"data:image/png;base64,{img}")]
-        elif name == "draw_ellipse":
-            img = draw_ellipse(arguments.get("center_x"), arguments.get("center_y"), arguments.get("width"), arguments.get("height"))
-            return [TextContent(type="text", text=f"data:image/png;base64,{img}")]
-        elif name == "draw_sin_curve":
-            img = draw_sin_curve(arguments.get("start_x", 0), arguments.get("end_x", 2*np.pi))
-            return [TextContent(type="text", text=f"data:image/png;base64,{img}")]
-        elif name == "draw_cos_curve":
-            img = draw_cos_curve(arguments.get("start_x", 0), arguments.get("end_x", 2*np.pi))
-            return [TextContent(type="text", text=f"data:image/png;base64,{img}")]
-        else:
-            return [TextContent(type="text", text=f"未知工具: {name}")]
+            return [TextContent(type="text", text=f"![circle]({uri})")]
+        return [TextContent(type="text", text=uri)]
     except Exception as e:
-        logger.error(f"绘图出错: {str(e)}", exc_info=True)
+        logger.error("绘图出错: %s", e, exc_info=True)
         return [TextContent(type="text", text=f"绘图出错: {str(e)}")]
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    logger.info("列出工具...")
-    return [
-        Tool(
-            name="draw_line",
-            description="绘制线段",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "x1": {"type": "number", "description": "起点x"},
-                    "y1": {"type": "number", "description": "起点y"},
-                    "x2": {"type": "number", "description": "终点x"},
-                    "y2": {"type": "number", "description": "终点y"}
+# 工具列表是固定的，导入时构建一次，每次列出工具直接复用
+_TOOLS: list[Tool] = [
+    Tool(
+        name="draw_line",
+        description="绘制线段",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "x1": {"type": "number", "description": "起点x"},
+                "y1": {"type": "number", "description": "起点y"},
+                "x2": {"type": "number", "description": "终点x"},
+                "y2": {"type": "number", "description": "终点y"},
+                "format": _FORMAT_SCHEMA
+            },
+            "required": ["x1", "y1", "x2", "y2"]
+        }
+    ),
+    Tool(
+        name="draw_triangle",
+        description="绘制三角形",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "points": {
+                    "type": "array",
+                    "description": "三角形三个顶点坐标，如[[x1,y1],[x2,y2],[x3,y3]]",
+                    "items": {"type": "array", "items": {"type": "number"}}
                 },
-                "required": ["x1", "y1", "x2", "y2"]
-            }
-        ),
-        Tool(
-            name="draw_triangle",
-            description="绘制三角形",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "points": {
-                        "type": "array",
-                        "description": "三角形三个顶点坐标，如[[x1,y1],[x2,y2],[x3,y3]]",
-                        "items": {"type": "array", "items": {"type": "number"}}
-                    }
+                "format": _FORMAT_SCHEMA
+            },
+            "required": ["points"]
+        }
+    ),
+    Tool(
+        name="draw_rectangle",
+        description="绘制矩形",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "x": {"type": "number", "description": "左上角x"},
+                "y": {"type": "number", "description": "左上角y"},
+                "width": {"type": "number", "description": "宽度"},
+                "height": {"type": "number", "description": "高度"},
+                "format": _FORMAT_SCHEMA
+            },
+            "required": ["x", "y", "width", "height"]
+        }
+    ),
+    Tool(
+        name="draw_polygon",
+        description="绘制多边形（如平行四边形）",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "points": {
+                    "type": "array",
+                    "description": "多边形顶点坐标，如[[x1,y1],[x2,y2],...]",
+                    "items": {"type": "array", "items": {"type": "number"}}
                 },
-                "required": ["points"]
-            }
-        ),
-        Tool(
-            name="draw_rectangle",
-            description="绘制矩形",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "x": {"type": "number", "description": "左上角x"},
-                    "y": {"type": "number", "description": "左上角y"},
-                    "width": {"type": "number", "description": "宽度"},
-                    "height": {"type": "number", "description": "高度"}
+                "format": _FORMAT_SCHEMA
+            },
+            "required": ["points"]
+        }
+    ),
+    Tool(
+        name="draw_trapezoid",
+        description="绘制梯形",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "points": {
+                    "type": "array",
+                    "description": "梯形四个顶点坐标，如[[x1,y1],[x2,y2],[x3,y3],[x4,y4]]",
+                    "items": {"type": "array", "items": {"type": "number"}}
                 },
-                "required": ["x", "y", "width", "height"]
+                "format": _FORMAT_SCHEMA
+            },
+            "required": ["points"]
+        }
+    ),
+    Tool(
+        name="draw_circle",
+        description="绘制圆",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "center_x": {"type": "number", "description": "圆心x"},
+                "center_y": {"type": "number", "description": "圆心y"},
+                "radius": {"type": "number", "description": "半径"},
+                "format": _FORMAT_SCHEMA
+            },
+            "required": ["center_x", "center_y", "radius"]
+        }
+    ),
+    Tool(
+        name="draw_ellipse",
+        description="绘制椭圆",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "center_x": {"type": "number", "description": "中心x"},
+                "center_y": {"type": "number", "description": "中心y"},
+                "width": {"type": "number", "description": "宽轴"},
+                "height": {"type": "number", "description": "高轴"},
+                "format": _FORMAT_SCHEMA
+            },
+            "required": ["center_x", "center_y", "width", "height"]
+        }
+    ),
+    Tool(
+        name="draw_sin_curve",
+        description="绘制正弦曲线",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_x": {"type": "number", "description": "起始x", "default": 0},
+                "end_x": {"type": "number", "description": "终止x", "default": 6.28}
             }
-        ),
-        Tool(
-            name="draw_polygon",
-            description="绘制多边形（如平行四边形）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "points": {
-                        "type": "array",
-                        "description": "多边形顶点坐标，如[[x1,y1],[x2,y2],...]",
-                        "items": {"type": "array", "items": {"type": "number"}}
-                    }
-                },
-                "required": ["points"]
-            }
-        ),
-        Tool(
-            name="draw_trapezoid",
-            description="绘制梯形",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "points": {
-                        "type": "array",
-                        "description": "梯形四个顶点坐标，如[[x1,y1],[x2,y2],[x3,y3],[x4,y4]]",
-                        "items": {"type": "array", "items": {"type": "number"}}
-                    }
-                },
-                "required": ["points"]
+        }
+    ),
+    Tool(
+        name="draw_cos_curve",
+        description="绘制余弦曲线",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_x": {"type": "number", "description": "起始x", "default": 0},
+                "end_x": {"type": "number", "description": "终止x", "default": 6.28}
             }
-        ),
-        Tool(
-            name="draw_circle",
-            description="绘制圆",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "center_x": {"type": "number", "description": "圆心x"},
-                    "center_y": {"type": "number", "description": "圆心y"},
-                    "radius": {"type": "number", "description": "半径"}
-                },
-                "required": ["center_x", "center_y", "radius"]
-            }
-        ),
-        Tool(
-            name="draw_ellipse",
-            description="绘制椭圆",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "center_x": {"type": "number", "description": "中心x"},
-                    "center_y": {"type": "number", "description": "中心y"},
-                    "width": {"type": "number", "description": "宽轴"},
-                    "height": {"type": "number", "description": "高轴"}
-                },
-                "required": ["center_x", "center_y", "width", "height"]
-            }
-        ),
-        Tool(
-            name="draw_sin_curve",
-            description="绘制正弦曲线",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_x": {"type": "number", "description": "起始x", "default": 0},
-                    "end_x": {"type": "number", "description": "终止x", "default": 6.28}
-                }
-            }
-        ),
-        Tool(
-            name="draw_cos_curve",
-            description="绘制余弦曲线",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_x": {"type": "number", "description": "起始x", "default": 0},
-                    "end_x": {"type": "number", "description": "终止x", "default": 6.28}
-                }
-            }
-        ),
-    ]
+        }
+    ),
+]
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    logger.info("列出工具...")
+    return _TOOLS
+
+# 资源列表同样是固定的
+_RESOURCES: list[Resource] = [
+    Resource(
+        uri="geometry://shapes",
+        name="几何图形绘制",
+        mimeType="image/svg+xml",
+        description="支持线段、三角形、矩形、多边形、梯形、圆、椭圆、正弦曲线、余弦曲线等；"
+                    "图形默认返回SVG（format=png时返回PNG），正弦、余弦曲线返回PNG"
+    )
+]
 
 @app.list_resources()
 async def list_resources() -> list[Resource]:
     logger.info("列出资源...")
-    return [
-        Resource(
-            uri="geometry://shapes",
-            name="几何图形绘制",
-            mimeType="image/png",
-            description="支持线段、三角形、矩形、多边形、梯形、圆、椭圆、正弦曲线、余弦曲线等"
-        )
-    ]
-
-def draw_line(x1, y1, x2, y2):
-    plt.figure()
-    plt.plot([x1, x2], [y1, y2], marker='o')
-    plt.title("Line")
-    plt.axis('equal')
-    return save_figure_to_base64()
-
-def draw_triangle(points):
-    pts = np.array(points + [points[0]])
-    plt.figure()
-    plt.plot(pts[:,0], pts[:,1], marker='o')
-    plt.title("Triangle")
-    plt.axis('equal')
-    return save_figure_to_base64()
-
-def draw_rectangle(x, y, width, height):
+    return _RESOURCES
+
+def _plot(x, y, title):
+    """在共享画布上更新曲线数据并返回base64编码的PNG图片"""
+    with _FIG_LOCK:
+        _LINE.set_data(x, y)
+        _AX.set_title(title)
+        _AX.relim()
+        _AX.autoscale_view()
+        return save_figure_to_base64()
+
+def draw_line(x1, y1, x2, y2, fmt="svg"):
+    return _polyline(np.array([[x1, y1], [x2, y2]], dtype=np.float64), fmt)
+
+def _draw_closed(points, fmt="svg"):
+    """绘制由顶点列表围成的闭合图形"""
+    pts = np.asarray(points, dtype=np.float64)
+    return _polyline(pts, fmt, closed=True)
+
+# 三角形、多边形和梯形的绘制完全相同，共用同一个函数，顶点相同时也共用同一条缓存
+draw_triangle = draw_polygon = draw_trapezoid = _draw_closed
+
+def draw_rectangle(x, y, width, height, fmt="svg"):
     rect = np.array([
         [x, y],
         [x+width, y],
         [x+width, y+height],
-        [x, y+height],
-        [x, y]
-    ])
-    plt.figure()
-    plt.plot(rect[:,0], rect[:,1], marker='o')
-    plt.title("Rectangle")
-    plt.axis('equal')
-    return save_figure_to_base64()
-
-def draw_polygon(points):
-    pts = np.array(points + [points[0]])
-    plt.figure()
-    plt.plot(pts[:,0], pts[:,1], marker='o')
-    plt.title("Polygon")
-    plt.axis('equal')
-    return save_figure_to_base64()
-
-def draw_trapezoid(points):
-    pts = np.array(points + [points[0]])
-    plt.figure()
-    plt.plot(pts[:,0], pts[:,1], marker='o')
-    plt.title("Trapezoid")
-    plt.axis('equal')
-    return save_figure_to_base64()
-
-def draw_circle(center_x, center_y, radius):
-    """绘制圆形并返回base64编码的PNG图片"""
-    plt.figure(figsize=(8, 8))
-    plt.clf()
-    
-    # 设置坐标轴范围
-    margin = radius * 0.2
-    plt.xlim(center_x - radius - margin, center_x + radius + margin)
-    plt.ylim(center_y - radius - margin, center_y + radius + margin)
-    
-    # 绘制坐标轴
-    plt.axhline(y=0, color='gray', linestyle='-', alpha=0.3)
-    plt.axvline(x=0, color='gray', linestyle='-', alpha=0.3)
-    plt.grid(True, alpha=0.3)
-    
-    # 生成圆的点
-    theta = np.linspace(0, 2*np.pi, 100)
-    x = center_x + radius * np.cos(theta)
-    y = center_y + radius * np.sin(theta)
-    
-    # 绘制圆
-    plt.plot(x, y, 'b-', linewidth=2)
-    plt.title(f"Circle (center: {center_x}, {center_y}, radius: {radius})")
-    plt.axis('equal')
-    
-    # 转换为base64
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=100, bbox_inches='tight', transparent=True)
-    plt.close()
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode('utf-8')
-
-def draw_ellipse(center_x, center_y, width, height):
-    theta = np.linspace(0, 2*np.pi, 100)
-    x = center_x + width/2 * np.cos(theta)
-    y = center_y + height/2 * np.sin(theta)
-    plt.figure()
-    plt.plot(x, y)
-    plt.title("Ellipse")
-    plt.axis('equal')
-    return save_figure_to_base64()
+        [x, y+height]
+    ], dtype=np.float64)
+    return _polyline(rect, fmt, closed=True)
+
+def draw_circle(center_x, center_y, radius, fmt="svg"):
+    """绘制圆形并返回base64编码的图片（默认SVG）"""
+    return _ellipse(center_x, center_y, radius, radius, fmt)
+
+def draw_ellipse(center_x, center_y, width, height, fmt="svg"):
+    return _ellipse(center_x, center_y, width/2, height/2, fmt)
+
+@functools.lru_cache(maxsize=128)
+def _curve_samples(fn, start_x, end_x, n=500):
+    """缓存曲线采样点，相同区间不再重复分配数组和计算三角函数"""
+    x = np.linspace(start_x, end_x, n)
+    y = fn(x)
+    # 缓存的数组会被多次共享，设为只读防止被修改
+    x.flags.writeable = False
+    y.flags.writeable = False
+    return x, y
+
+def _curve_sample_count(start_x, end_x):
+    """按区间宽度选择采样点数（每单位约32个点，限制在64到500之间）"""
+    return max(64, min(500, int(round(abs(end_x - start_x) * 32))))
 
 def draw_sin_curve(start_x, end_x):
-    x = np.linspace(start_x, end_x, 500)
-    y = np.sin(x)
-    plt.figure()
-    plt.plot(x, y)
-    plt.title("Sine Curve")
-    plt.axis('equal')
-    return save_figure_to_base64()
+    x, y = _curve_samples(np.sin, start_x, end_x, _curve_sample_count(start_x, end_x))
+    return _plot(x, y, "Sine Curve")
 
 def draw_cos_curve(start_x, end_x):
-    x = np.linspace(start_x, end_x, 500)
-    y = np.cos(x)
-    plt.figure()
-    plt.plot(x, y)
-    plt.title("Cosine Curve")
-    plt.axis('equal')
-    return save_figure_to_base64()
+    x, y = _curve_samples(np.cos, start_x, end_x, _curve_sample_count(start_x, end_x))
+    return _plot(x, y, "Cosine Curve")
+
+# 必填参数的占位默认值
+_REQUIRED = object()
+
+# 工具名 -> (绘图函数, 参数名, 默认值)，参数按顺序传给绘图函数
+HANDLERS: dict[str, tuple[Callable, tuple[str, ...], tuple[Any, ...]]] = {
+    "draw_line": (draw_line, ("x1", "y1", "x2", "y2", "format"), (_REQUIRED, _REQUIRED, _REQUIRED, _REQUIRED, "svg")),
+    "draw_triangle": (draw_triangle, ("points", "format"), (_REQUIRED, "svg")),
+    "draw_rectangle": (draw_rectangle, ("x", "y", "width", "height", "format"), (_REQUIRED, _REQUIRED, _REQUIRED, _REQUIRED, "svg")),
+    "draw_polygon": (draw_polygon, ("points", "format"), (_REQUIRED, "svg")),
+    "draw_trapezoid": (draw_trapezoid, ("points", "format"), (_REQUIRED, "svg")),
+    "draw_circle": (draw_circle, ("center_x", "center_y", "radius", "format"), (_REQUIRED, _REQUIRED, _REQUIRED, "svg")),
+    "draw_ellipse": (draw_ellipse, ("center_x", "center_y", "width", "height", "format"), (_REQUIRED, _REQUIRED, _REQUIRED, _REQUIRED, "svg")),
+    "draw_sin_curve": (draw_sin_curve, ("start_x", "end_x"), (0, 2*np.pi)),
+    "draw_cos_curve": (draw_cos_curve, ("start_x", "end_x"), (0, 2*np.pi)),
+}
+
+# 启动时预先渲染的常用调用：(工具名, 参数)，参数与客户端请求时的写法一致
+DEFAULT_WARMUP = [
+    ("draw_sin_curve", {}),
+    ("draw_cos_curve", {}),
+    ("draw_circle", {"center_x": 0, "center_y": 0, "radius": 1}),
+]
+
+def _warm_cache():
+    """按call_tool相同的参数处理方式渲染DEFAULT_WARMUP，填充渲染缓存"""
+    for name, arguments in DEFAULT_WARMUP:
+        fn, names, defaults = HANDLERS[name]
+        _render(fn, *[arguments.get(n, d) for n, d in zip(names, defaults)])
+    logger.info("渲染缓存预热完成，缓存条目: %d", _cached_render.cache_info().currsize)
 
 async def main():
     from mcp.server.stdio import stdio_server
@@ -384,6 +522,9 @@ async def main():
     sys.stdout.flush()
     sys.stderr.flush()
 
+    if GEOM_CACHE:
+        _warm_cache()
+
     logger.info("MCP服务即将启动并进入监听状态...")
 
     async with stdio_server() as (read_stream, write_stream):
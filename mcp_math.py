@@ -5,16 +5,18 @@ import logging
 import os
 import sys
 import math
+import numpy as np
 import signal  # 添加这行导入
-from typing import Dict, Any
+from typing import Dict, Any, Callable
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
 
 # 配置日志
+# 日志级别默认INFO，可通过 LOG_LEVEL 环境变量调整；输出到stderr，stdout留给MCP的stdio传输
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
+    handlers=[logging.StreamHandler(sys.stderr)]
 )
 logger = logging.getLogger("math-service")
 
@@ -69,48 +71,53 @@ def calculate_trapezoid(a: float, b: float, h: float, c: float = None, d: float
         "perimeter": perimeter
     }
 
-def calculate_trig_functions(angle_degrees: float) -> Dict[str, float]:
-    """计算三角函数值"""
-    angle_rad = math.radians(angle_degrees)
-    return {
-        "sin": math.sin(angle_rad),
-        "cos": math.cos(angle_rad),
-        "tan": math.tan(angle_rad),
-        "cot": 1 / math.tan(angle_rad) if math.tan(angle_rad) != 0 else float('inf')
-    }
+def calculate_trig_functions(angle_degrees) -> Dict[str, Any]:
+    """计算三角函数值，angle_degrees可以是单个角度或角度列表（批量计算）"""
+    angle_rad = np.deg2rad(np.atleast_1d(np.asarray(angle_degrees, dtype=np.float64)))
+    # tan和cot由sin、cos推导，整个数组只需两次向量化三角函数计算
+    s = np.sin(angle_rad)
+    c = np.cos(angle_rad)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tan = np.where(c != 0, s / c, np.inf)
+        cot = np.where(s != 0, c / s, np.inf)
+    result = {"sin": s, "cos": c, "tan": tan, "cot": cot}
+    if np.ndim(angle_degrees) == 0:
+        return {k: float(v[0]) for k, v in result.items()}
+    return {k: v.tolist() for k, v in result.items()}
+
+def _to_angles(value):
+    """trig_functions的angle参数：单个角度转为float，角度列表逐项转换"""
+    if isinstance(value, (list, tuple)):
+        return [float(v) for v in value]
+    return float(value)
+
+# 必填参数的占位默认值
+_REQUIRED = object()
+
+# 工具名 -> (计算函数, 参数名, 默认值, 转换函数)，参数逐个转换后按顺序传给计算函数；
+# 只有trig_functions的angle接受列表，其余参数都是单个数值
+HANDLERS: dict[str, tuple[Callable, tuple[str, ...], tuple[Any, ...], tuple[Callable, ...]]] = {
+    "triangle_calc": (calculate_triangle, ("base", "height", "a", "b", "c"), (_REQUIRED, _REQUIRED, None, None, None), (float,) * 5),
+    "circle_calc": (calculate_circle, ("radius",), (_REQUIRED,), (float,)),
+    "ellipse_calc": (calculate_ellipse, ("a", "b"), (_REQUIRED, _REQUIRED), (float,) * 2),
+    "trapezoid_calc": (calculate_trapezoid, ("a", "b", "height", "c", "d"), (_REQUIRED, _REQUIRED, _REQUIRED, None, None), (float,) * 5),
+    "trig_functions": (calculate_trig_functions, ("angle",), (_REQUIRED,), (_to_angles,)),
+}
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """处理工具调用"""
-    logger.info(f"调用工具: {name}, 参数: {arguments}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("调用工具: %s, 参数: %s", name, arguments)
     
     try:
         result = None
-        if name == "triangle_calc":
-            result = calculate_triangle(
-                float(arguments["base"]),
-                float(arguments["height"]),
-                float(arguments.get("a", None)),
-                float(arguments.get("b", None)),
-                float(arguments.get("c", None))
-            )
-        elif name == "circle_calc":
-            result = calculate_circle(float(arguments["radius"]))
-        elif name == "ellipse_calc":
-            result = calculate_ellipse(
-                float(arguments["a"]),
-                float(arguments["b"])
-            )
-        elif name == "trapezoid_calc":
-            result = calculate_trapezoid(
-                float(arguments["a"]),
-                float(arguments["b"]),
-                float(arguments["height"]),
-                float(arguments.get("c", None)),
-                float(arguments.get("d", None))
-            )
-        elif name == "trig_functions":
-            result = calculate_trig_functions(float(arguments["angle"]))
+        handler = HANDLERS.get(name)
+        if handler is not None:
+            fn, names, defaults, converters = handler
+            # 可选参数未提供时保持None，否则转换为数值
+            values = [arguments[n] if d is _REQUIRED else arguments.get(n, d) for n, d in zip(names, defaults)]
+            result = fn(*[None if v is None else conv(v) for v, conv in zip(values, converters)])
         
         if result:
             return [TextContent(type="text", text=str(result))]
@@ -118,92 +125,102 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             return [TextContent(type="text", text="未知的计算类型")]
             
     except Exception as e:
-        logger.error(f"计算出错: {str(e)}", exc_info=True)
+        logger.error("计算出错: %s", e, exc_info=True)
         return [TextContent(type="text", text=f"计算出错: {str(e)}")]
 
+# 工具列表是固定的，导入时构建一次，每次列出工具直接复用
+_TOOLS: list[Tool] = [
+    Tool(
+        name="triangle_calc",
+        description="计算三角形的面积和周长",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "base": {"type": "number", "description": "底边长"},
+                "height": {"type": "number", "description": "高"},
+                "a": {"type": "number", "description": "边长a（可选）"},
+                "b": {"type": "number", "description": "边长b（可选）"},
+                "c": {"type": "number", "description": "边长c（可选）"}
+            },
+            "required": ["base", "height"]
+        }
+    ),
+    Tool(
+        name="circle_calc",
+        description="计算圆的面积和周长",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "radius": {"type": "number", "description": "半径"}
+            },
+            "required": ["radius"]
+        }
+    ),
+    Tool(
+        name="ellipse_calc",
+        description="计算椭圆的面积和周长",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "a": {"type": "number", "description": "长半轴"},
+                "b": {"type": "number", "description": "短半轴"}
+            },
+            "required": ["a", "b"]
+        }
+    ),
+    Tool(
+        name="trapezoid_calc",
+        description="计算梯形的面积和周长",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "a": {"type": "number", "description": "上底"},
+                "b": {"type": "number", "description": "下底"},
+                "height": {"type": "number", "description": "高"},
+                "c": {"type": "number", "description": "左边长（可选）"},
+                "d": {"type": "number", "description": "右边长（可选）"}
+            },
+            "required": ["a", "b", "height"]
+        }
+    ),
+    Tool(
+        name="trig_functions",
+        description="计算三角函数值（正弦、余弦、正切、余切）",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "angle": {
+                    "type": ["number", "array"],
+                    "description": "角度值（度），传入数组可批量计算",
+                    "items": {"type": "number"}
+                }
+            },
+            "required": ["angle"]
+        }
+    )
+]
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """列出可用的数学计算工具"""
     logger.info("列出工具...")
-    return [
-        Tool(
-            name="triangle_calc",
-            description="计算三角形的面积和周长",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base": {"type": "number", "description": "底边长"},
-                    "height": {"type": "number", "description": "高"},
-                    "a": {"type": "number", "description": "边长a（可选）"},
-                    "b": {"type": "number", "description": "边长b（可选）"},
-                    "c": {"type": "number", "description": "边长c（可选）"}
-                },
-                "required": ["base", "height"]
-            }
-        ),
-        Tool(
-            name="circle_calc",
-            description="计算圆的面积和周长",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "radius": {"type": "number", "description": "半径"}
-                },
-                "required": ["radius"]
-            }
-        ),
-        Tool(
-            name="ellipse_calc",
-            description="计算椭圆的面积和周长",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "a": {"type": "number", "description": "长半轴"},
-                    "b": {"type": "number", "description": "短半轴"}
-                },
-                "required": ["a", "b"]
-            }
-        ),
-        Tool(
-            name="trapezoid_calc",
-            description="计算梯形的面积和周长",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "a": {"type": "number", "description": "上底"},
-                    "b": {"type": "number", "description": "下底"},
-                    "height": {"type": "number", "description": "高"},
-                    "c": {"type": "number", "description": "左边长（可选）"},
-                    "d": {"type": "number", "description": "右边长（可选）"}
-                },
-                "required": ["a", "b", "height"]
-            }
-        ),
-        Tool(
-            name="trig_functions",
-            description="计算三角函数值（正弦、余弦、正切、余切）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "angle": {"type": "number", "description": "角度值（度）"}
-                },
-                "required": ["angle"]
-            }
-        )
-    ]
+    return _TOOLS
+
+# 资源列表同样是固定的
+_RESOURCES: list[Resource] = [
+    Resource(
+        uri="math://formulas",
+        name="数学公式计算服务",
+        mimeType="application/json",
+        description="提供各种几何图形的面积周长计算和三角函数计算"
+    )
+]
 
 @app.list_resources()
 async def list_resources() -> list[Resource]:
     """列出可用的数学计算资源"""
     logger.info("列出资源...")
-    return [
-        Resource(
-            uri="math://formulas",
-            name="数学公式计算服务",
-            mimeType="application/json",
-            description="提供各种几何图形的面积周长计算和三角函数计算"
-        )
-    ]
+    return _RESOURCES
 
 async def main():
     """主入口点"""
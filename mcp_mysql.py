@@ -3,35 +3,49 @@
 import asyncio
 import logging
 import os
+import re
 import sys
-from mysql.connector import connect, Error
+import functools
+import threading
+import orjson
+from contextlib import contextmanager
+from mysql.connector import Error, HAVE_CEXT
+from mysql.connector.pooling import CNX_POOL_MAXSIZE, MySQLConnectionPool
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
 import signal
 import time
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
 
-# 配置更详细的日志
+try:
+    import uvloop  # 可选依赖：安装后使用基于libuv的事件循环
+except ImportError:
+    uvloop = None
+
+# 配置日志：默认WARNING级别，可通过 LOG_LEVEL 环境变量调整（如DEBUG）
 logging.basicConfig(
-    level=logging.DEBUG,  # 改为DEBUG级别，显示更多信息
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
-        logging.StreamHandler(sys.stdout)  # 确保日志输出到标准输出
+        logging.StreamHandler(sys.stderr)  # 输出到标准错误，标准输出留给MCP的stdio传输
     ]
 )
 logger = logging.getLogger("mysql-service")
 
 # 启动时记录Python版本和工作目录
-logger.info(f"Python版本: {sys.version}")
-logger.info(f"当前工作目录: {os.getcwd()}")
-logger.info(f"脚本路径: {__file__}")
+logger.info("Python版本: %s", sys.version)
+logger.info("当前工作目录: %s", os.getcwd())
+logger.info("脚本路径: %s", __file__)
 
 # Initialize MCP server
 logger.info("初始化MCP服务器: mysql-service")
 app = Server("mysql-service")
 
 
-def get_db_config():
-    """Get database configuration from environment variables."""
+@functools.lru_cache(maxsize=1)
+def _build_db_config():
+    """Read database configuration from environment variables (once per process)."""
     config = {
         "host": os.getenv("MYSQL_HOST", "localhost"),
         "port": int(os.getenv("MYSQL_PORT", "3306")),
@@ -44,7 +58,11 @@ def get_db_config():
         # Disable autocommit for better transaction control
         "autocommit": True,
         # Set SQL mode for better compatibility - can be overridden
-        "sql_mode": os.getenv("MYSQL_SQL_MODE", "TRADITIONAL")
+        "sql_mode": os.getenv("MYSQL_SQL_MODE", "TRADITIONAL"),
+        # Results are streamed with unbuffered cursors; drain unread rows when a result is cut short
+        "consume_results": True,
+        # 默认用C扩展解析MySQL协议和结果行，MYSQL_USE_PURE=1 时使用纯Python实现；没有C扩展时只能使用纯Python实现
+        "use_pure": os.getenv("MYSQL_USE_PURE", "0") == "1" or not HAVE_CEXT
     }
 
     # Remove None values to let MySQL connector use defaults if not specified
@@ -54,167 +72,327 @@ def get_db_config():
     safe_config = config.copy()
     if "password" in safe_config:
         safe_config["password"] = "******"  # 隐藏密码
-    logger.info(f"MySQL配置: {safe_config}")
+    logger.info("MySQL配置: %s", safe_config)
+    if not HAVE_CEXT:
+        logger.warning("mysql-connector-python的C扩展不可用，使用纯Python协议实现，读取大结果集会明显变慢")
+    logger.info("MySQL协议实现: %s", "纯Python" if config["use_pure"] else "C扩展")
 
     return config
 
 
-def get_mysql_connection():
-    """获取本地MySQL连接"""
-    config = get_db_config()
-    logger.debug(f"尝试连接MySQL: {config['host']}:{config['port']}")
+def get_db_config():
+    """Get database configuration from environment variables.
+
+    The configuration is read on first use and cached; callers must not mutate it.
+    """
+    return _build_db_config()
+
+
+# 进程级连接池，首次使用时创建；连接用完后归还连接池，而不是断开TCP连接
+_pool = None
+_pool_lock = threading.Lock()
+# 连接池耗尽时get_connection会直接报错，用信号量让多余的工作线程排队等待空闲连接
+_pool_slots = None
+
+
+def _pool_size():
+    """读取MYSQL_POOL_SIZE；mysql-connector只接受1到CNX_POOL_MAXSIZE（32），超出范围时取边界值"""
+    value = os.getenv("MYSQL_POOL_SIZE", "10")
     try:
-        conn = connect(**config)
-        logger.debug(f"MySQL连接成功，服务器版本: {conn.get_server_info()}")
-        return conn
-    except Error as e:
-        logger.error(f"MySQL连接失败: {str(e)}")
-        logger.error(f"错误代码: {e.errno}, SQL状态: {e.sqlstate}")
-        raise
+        size = int(value)
+    except ValueError:
+        logger.warning("MYSQL_POOL_SIZE=%r 不是整数，使用默认值10", value)
+        return 10
+    clamped = min(max(size, 1), CNX_POOL_MAXSIZE)
+    if clamped != size:
+        logger.warning("MYSQL_POOL_SIZE=%s 超出范围1-%s，使用%s", size, CNX_POOL_MAXSIZE, clamped)
+    return clamped
+
+
+def get_connection_pool():
+    """获取（必要时创建）MySQL连接池"""
+    global _pool, _pool_slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool_size = _pool_size()
+                logger.info("创建MySQL连接池，大小: %s", pool_size)
+                _pool = MySQLConnectionPool(pool_name="mcp", pool_size=pool_size, **get_db_config())
+                _pool_slots = threading.BoundedSemaphore(pool_size)
+    return _pool
+
+
+def close_connection_pool():
+    """关闭连接池中的空闲连接并丢弃连接池（退出时调用，借出的连接应已归还）"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            # MySQLConnectionPool没有公开的关闭方法；_remove_connections是mysql-connector-python
+            # （>=9.1）连接池的内部方法，会关闭队列中所有空闲连接。以后版本若移除它，只跳过关闭
+            remove_connections = getattr(_pool, "_remove_connections", None)
+            if remove_connections is not None:
+                closed = remove_connections()
+                logger.info("已关闭连接池中的 %s 个连接", closed)
+            else:
+                logger.warning("当前mysql-connector版本不支持关闭连接池，空闲连接将随进程退出断开")
+            _pool = None
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-    """执行MySQL工具。"""
-    logger.info(f"调用工具: {name}, 参数: {arguments}")
+@contextmanager
+def pooled_connection():
+    """从连接池借出一个连接，退出时归还；连接池已满时等待"""
+    pool = get_connection_pool()
+    with _pool_slots:
+        conn = pool.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
 
-    if name == "query_mysql":
-        sql = arguments.get("sql")
-        if not sql:
-            return [TextContent(type="text", text="SQL查询语句是必需的")]
 
-        result = await query_mysql(sql)
-        return [TextContent(type="text", text=str(result))]
+# 无缓冲游标每次从服务器取回的行数
+FETCH_ARRAYSIZE = int(os.getenv("MYSQL_ARRAYSIZE", "500"))
 
-    elif name == "list_databases":
-        result = await list_databases()
-        return [TextContent(type="text", text=str(result))]
+# query_mysql默认最多返回的行数
+DEFAULT_MAX_ROWS = 10000
 
-    elif name == "list_tables":
-        database = arguments.get("database")
-        if not database:
-            return [TextContent(type="text", text="数据库名是必需的")]
 
-        result = await list_tables(database)
-        return [TextContent(type="text", text=str(result))]
+def _run_query(sql, params=None, dictionary=True, max_rows=None):
+    """
+    在连接池连接上同步执行一条SQL（在线程中调用，避免阻塞事件循环）
 
-    elif name == "describe_table":
-        database = arguments.get("database")
-        table = arguments.get("table")
-        if not database or not table:
-            return [TextContent(type="text", text="数据库名和表名都是必需的")]
+    结果集通过无缓冲游标按FETCH_ARRAYSIZE分批读取。指定max_rows时最多读取
+    max_rows + 1行，调用方据此判断结果是否被截断，剩余的行不会进入内存。
 
-        result = await describe_table(database, table)
-        return [TextContent(type="text", text=str(result))]
+    Returns:
+        (结果行列表, 影响行数)；语句没有结果集时结果行列表为None
+    """
+    with pooled_connection() as conn, conn.cursor(dictionary=dictionary, buffered=False) as cursor:
+        cursor.arraysize = FETCH_ARRAYSIZE
+        cursor.execute(sql, params)
+        # 如果是SELECT等返回结果集的查询
+        if cursor.description:
+            rows = []
+            while max_rows is None or len(rows) <= max_rows:
+                size = cursor.arraysize if max_rows is None else min(cursor.arraysize, max_rows + 1 - len(rows))
+                batch = cursor.fetchmany(size)
+                if not batch:
+                    break
+                rows.extend(batch)
+            return rows, cursor.rowcount
+        # 非SELECT查询（如INSERT, UPDATE, DELETE）
+        conn.commit()
+        return None, cursor.rowcount
+
+
+# 允许拼接进SQL的库名/表名/字段名：字母（含中文等Unicode字母）、数字、下划线和$，最长64个字符
+_IDENT = re.compile(r"[\w$]{1,64}")
+
+
+def _q(name: str) -> str:
+    """校验标识符并加反引号；不合法时抛出ValueError，避免把任意文本拼接进SQL"""
+    if not isinstance(name, str) or not _IDENT.fullmatch(name):
+        raise ValueError(f"非法的标识符: {name!r}")
+    return f"`{name}`"
+
+
+def _json_default(value):
+    """orjson不能直接序列化的列值：二进制能按UTF-8解码时返回文本，否则返回0x开头的十六进制
+    （与MySQL十六进制字面量写法相同，不丢失数据）；Decimal等其他类型转为字符串"""
+    if isinstance(value, (bytes, bytearray)):
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return "0x" + value.hex()
+    return str(value)
 
-    elif name == "search_table":
-        database = arguments.get("database")
-        table = arguments.get("table")
-        column = arguments.get("column")
-        keyword = arguments.get("keyword")
-        limit = arguments.get("limit", 20)
 
-        if not all([database, table, column, keyword]):
-            return [TextContent(type="text", text="数据库名、表名、字段名和关键字都是必需的")]
+def _encode(obj) -> str:
+    """把工具结果序列化为JSON文本（datetime等类型由orjson原生处理）"""
+    return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
 
-        result = await search_table(database, table, column, keyword, limit)
-        return [TextContent(type="text", text=str(result))]
 
-    else:
-        return [TextContent(type="text", text=f"未知工具: {name}")]
+def _text(text: str) -> list[TextContent]:
+    return [TextContent(type="text", text=text)]
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """列出可用的MySQL工具。"""
-    logger.info("列出工具...")
-    return [
-        Tool(
-            name="query_mysql",
-            description="执行SQL查询并返回结果",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sql": {
-                        "type": "string",
-                        "description": "要执行的SQL语句（建议只支持SELECT）"
-                    }
+def _require(arguments: dict, *names: str) -> tuple[Any, ...] | None:
+    """按顺序取出必需参数；任一缺失或为空时返回None"""
+    values = tuple(arguments.get(n) for n in names)
+    return values if all(values) else None
+
+
+async def _do_query(arguments: dict) -> list[TextContent]:
+    args = _require(arguments, "sql")
+    if args is None:
+        return _text("SQL查询语句是必需的")
+    max_rows = arguments.get("max_rows")
+    if max_rows is None:
+        max_rows = DEFAULT_MAX_ROWS
+    elif isinstance(max_rows, bool) or not isinstance(max_rows, int) or max_rows < 0:
+        return _text("max_rows必须是非负整数")
+    (sql,) = args
+    return _text(_encode(await query_mysql(sql, max_rows)))
+
+
+async def _do_list_dbs(arguments: dict) -> list[TextContent]:
+    return _text(_encode(await list_databases()))
+
+
+async def _do_list_tables(arguments: dict) -> list[TextContent]:
+    args = _require(arguments, "database")
+    if args is None:
+        return _text("数据库名是必需的")
+    (database,) = args
+    return _text(_encode(await list_tables(database)))
+
+
+async def _do_describe(arguments: dict) -> list[TextContent]:
+    args = _require(arguments, "database", "table")
+    if args is None:
+        return _text("数据库名和表名都是必需的")
+    database, table = args
+    return _text(_encode(await describe_table(database, table)))
+
+
+async def _do_search(arguments: dict) -> list[TextContent]:
+    args = _require(arguments, "database", "table", "column", "keyword")
+    if args is None:
+        return _text("数据库名、表名、字段名和关键字都是必需的")
+    database, table, column, keyword = args
+    return _text(_encode(await search_table(database, table, column, keyword, arguments.get("limit", 20))))
+
+
+# 工具名 -> 处理函数（接收原始参数字典，返回TextContent列表）
+_TOOL_HANDLERS = {
+    "query_mysql": _do_query,
+    "list_databases": _do_list_dbs,
+    "list_tables": _do_list_tables,
+    "describe_table": _do_describe,
+    "search_table": _do_search,
+}
+
+
+@app.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """执行MySQL工具。"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("调用工具: %s, 参数: %s", name, arguments)
+
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        return _text(f"未知工具: {name}")
+    return await handler(arguments)
+
+
+# 工具定义是静态数据，导入时构建一次，list_tools每次返回同一个列表
+_TOOLS: list[Tool] = [
+    Tool(
+        name="query_mysql",
+        description="执行SQL查询并返回结果",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sql": {
+                    "type": "string",
+                    "description": "要执行的SQL语句（建议只支持SELECT）"
                 },
-                "required": ["sql"]
-            }
-        ),
-        Tool(
-            name="list_databases",
-            description="查看MySQL服务器上的所有数据库",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="list_tables",
-            description="查看指定数据库的所有表",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {
-                        "type": "string",
-                        "description": "数据库名"
-                    }
+                "max_rows": {
+                    "type": "integer",
+                    "description": f"最多返回的行数，默认{DEFAULT_MAX_ROWS}，超出部分会被截断",
+                    "default": DEFAULT_MAX_ROWS
+                }
+            },
+            "required": ["sql"]
+        }
+    ),
+    Tool(
+        name="list_databases",
+        description="查看MySQL服务器上的所有数据库",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="list_tables",
+        description="查看指定数据库的所有表",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "数据库名"
+                }
+            },
+            "required": ["database"]
+        }
+    ),
+    Tool(
+        name="describe_table",
+        description="查看指定表的结构",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "数据库名"
                 },
-                "required": ["database"]
-            }
-        ),
-        Tool(
-            name="describe_table",
-            description="查看指定表的结构",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {
-                        "type": "string",
-                        "description": "数据库名"
-                    },
-                    "table": {
-                        "type": "string",
-                        "description": "表名"
-                    }
+                "table": {
+                    "type": "string",
+                    "description": "表名"
+                }
+            },
+            "required": ["database", "table"]
+        }
+    ),
+    Tool(
+        name="search_table",
+        description="在指定表的指定字段中搜索包含关键字的数据",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "数据库名"
                 },
-                "required": ["database", "table"]
-            }
-        ),
-        Tool(
-            name="search_table",
-            description="在指定表的指定字段中搜索包含关键字的数据",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {
-                        "type": "string",
-                        "description": "数据库名"
-                    },
-                    "table": {
-                        "type": "string",
-                        "description": "表名"
-                    },
-                    "column": {
-                        "type": "string",
-                        "description": "字段名"
-                    },
-                    "keyword": {
-                        "type": "string",
-                        "description": "关键字"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "返回条数，默认20",
-                        "default": 20
-                    }
+                "table": {
+                    "type": "string",
+                    "description": "表名"
                 },
-                "required": ["database", "table", "column", "keyword"]
-            }
-        )
-    ]
+                "column": {
+                    "type": "string",
+                    "description": "字段名"
+                },
+                "keyword": {
+                    "type": "string",
+                    "description": "关键字"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "返回条数，默认20",
+                    "default": 20
+                }
+            },
+            "required": ["database", "table", "column", "keyword"]
+        }
+    )
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """列出可用的MySQL工具。"""
+    logger.info("列出工具...")
+    return _TOOLS
+
+
+# 一次查询information_schema取得所有用户数据库（排除系统库）；
+# 若以后资源需要包含表，也应一次查询information_schema.TABLES后在Python中分组，而不是逐库SHOW TABLES
+_LIST_RESOURCES_SQL = (
+    "SELECT SCHEMA_NAME FROM information_schema.SCHEMATA "
+    "WHERE SCHEMA_NAME NOT IN ('mysql', 'sys', 'performance_schema', 'information_schema')"
+)
 
 
 @app.list_resources()
@@ -222,63 +400,81 @@ async def list_resources() -> list[Resource]:
     """列出MySQL表作为资源。"""
     logger.info("列出资源...")
     try:
-        conn = get_mysql_connection()
-        with conn.cursor() as cursor:
-            cursor.execute("SHOW DATABASES")
-            databases = cursor.fetchall()
-
-            resources = []
-            for db in databases:
-                db_name = db[0]
-                resources.append(
-                    Resource(
-                        uri=f"mysql://{db_name}",
-                        name=f"数据库: {db_name}",
-                        mimeType="text/plain",
-                        description=f"数据库: {db_name}"
-                    )
-                )
-            return resources
+        databases, _ = await asyncio.to_thread(_run_query, _LIST_RESOURCES_SQL, dictionary=False)
+        return [
+            Resource(
+                uri=f"mysql://{db_name}",
+                name=f"数据库: {db_name}",
+                mimeType="text/plain",
+                description=f"数据库: {db_name}"
+            )
+            for (db_name,) in databases
+        ]
     except Error as e:
-        logger.error(f"列出资源失败: {str(e)}")
-        logger.error(f"错误代码: {e.errno}, SQL状态: {e.sqlstate}")
+        logger.error("列出资源失败: %s", e)
+        logger.error("错误代码: %s, SQL状态: %s", e.errno, e.sqlstate)
         return []
 
 
-async def query_mysql(sql: str) -> dict:
+# 库/表/表结构等元数据缓存的有效期（秒），设置 MYSQL_META_TTL=0 可关闭
+META_TTL = float(os.getenv("MYSQL_META_TTL", "30"))
+_META_CACHE_SIZE = 1024
+# (工具名, 参数...) -> (过期时间, 结果)；只在事件循环线程中读写，不需要加锁
+_meta_cache: dict = {}
+
+
+def _meta_get(key):
+    """取出未过期的元数据缓存结果，没有或已过期时返回None"""
+    if META_TTL <= 0:
+        return None
+    entry = _meta_cache.get(key)
+    if entry is None:
+        return None
+    expires, value = entry
+    if expires < time.monotonic():
+        del _meta_cache[key]
+        return None
+    return value
+
+
+def _meta_put(key, value):
+    """缓存一条元数据结果；缓存已满时淘汰最早写入的条目"""
+    if META_TTL <= 0:
+        return
+    if key not in _meta_cache and len(_meta_cache) >= _META_CACHE_SIZE:
+        del _meta_cache[next(iter(_meta_cache))]
+    _meta_cache[key] = (time.monotonic() + META_TTL, value)
+
+
+async def query_mysql(sql: str, max_rows: int = DEFAULT_MAX_ROWS) -> dict:
     """
     执行SQL查询并返回结果
 
     Args:
         sql: 要执行的SQL语句（建议只支持SELECT）
+        max_rows: 最多返回的行数，超出时结果被截断并标记truncated
 
     Returns:
         查询结果字典
     """
 
-    logger.info(f"执行SQL: {sql}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("执行SQL: %s", sql)
     try:
-        conn = get_mysql_connection()
-        with conn.cursor(dictionary=True) as cursor:
-            logger.debug(f"执行查询: {sql}")
-            cursor.execute(sql)
-
-            # 如果是SELECT等返回结果集的查询
-            if cursor.description:
-                result = cursor.fetchall()
-                logger.debug(f"查询结果: {len(result)}行")
-                return {"status": "succeed", "data": result}
-            # 非SELECT查询（如INSERT, UPDATE, DELETE）
-            else:
-                conn.commit()
-                return {"status": "succeed", "affected_rows": cursor.rowcount}
+        result, rowcount = await asyncio.to_thread(_run_query, sql, max_rows=max_rows)
+        if result is not None:
+            logger.debug("查询结果: %s行", len(result))
+            if len(result) > max_rows:
+                del result[max_rows:]
+                return {"status": "succeed", "data": result, "truncated": True}
+            return {"status": "succeed", "data": result}
+        # 非SELECT语句可能是DDL，清空元数据缓存，避免返回过期的库表结构
+        _meta_cache.clear()
+        return {"status": "succeed", "affected_rows": rowcount}
     except Error as e:
-        logger.error(f"MySQL查询出错: {str(e)}")
-        logger.error(f"错误代码: {e.errno}, SQL状态: {e.sqlstate}")
+        logger.error("MySQL查询出错: %s", e)
+        logger.error("错误代码: %s, SQL状态: %s", e.errno, e.sqlstate)
         return {"status": "error", "error": str(e)}
-    finally:
-        if 'conn' in locals() and conn:
-            conn.close()
 
 
 async def list_databases() -> dict:
@@ -288,19 +484,28 @@ async def list_databases() -> dict:
         数据库列表
     """
     logger.info("列出所有数据库")
+    key = ("list_databases",)
+    cached = _meta_get(key)
+    if cached is not None:
+        return cached
     try:
-        conn = get_mysql_connection()
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute("SHOW DATABASES")
-            result = [row['Database'] for row in cursor.fetchall()]
-        conn.close()
-        return {"status": "succeed", "databases": result}
+        rows, _ = await asyncio.to_thread(_run_query, "SHOW DATABASES")
+        result = {"status": "succeed", "databases": [row['Database'] for row in rows]}
+        _meta_put(key, result)
+        return result
     except Error as e:
-        logger.error(f"列数据库出错: {str(e)}")
-        logger.error(f"错误代码: {e.errno}, SQL状态: {e.sqlstate}")
+        logger.error("列数据库出错: %s", e)
+        logger.error("错误代码: %s, SQL状态: %s", e.errno, e.sqlstate)
         return {"status": "error", "error": str(e)}
 
 
+# 一条参数化语句取得库中所有表，不需要先USE切换当前库（省去一次往返）
+_LIST_TABLES_SQL = (
+    "SELECT TABLE_NAME FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = %s ORDER BY TABLE_NAME"
+)
+
+
 async def list_tables(database: str) -> dict:
     """
     查看指定数据库的所有表
@@ -309,19 +514,22 @@ async def list_tables(database: str) -> dict:
     Returns:
         表名列表
     """
-    logger.info(f"列出数据库 {database} 的所有表")
+    logger.info("列出数据库 %s 的所有表", database)
+    # 库名作为参数绑定，不需要_q校验，但必须是字符串才能作为缓存键
+    if not isinstance(database, str):
+        return {"status": "error", "error": f"非法的数据库名: {database!r}"}
+    key = ("list_tables", database)
+    cached = _meta_get(key)
+    if cached is not None:
+        return cached
     try:
-        conn = get_mysql_connection()
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute(f"USE `{database}`")
-            cursor.execute("SHOW TABLES")
-            tables_key = f"Tables_in_{database}"
-            result = [row[tables_key] for row in cursor.fetchall()]
-        conn.close()
-        return {"status": "succeed", "tables": result}
+        rows, _ = await asyncio.to_thread(_run_query, _LIST_TABLES_SQL, (database,), dictionary=False)
+        result = {"status": "succeed", "tables": [table_name for (table_name,) in rows]}
+        _meta_put(key, result)
+        return result
     except Error as e:
-        logger.error(f"列表出错: {str(e)}")
-        logger.error(f"错误代码: {e.errno}, SQL状态: {e.sqlstate}")
+        logger.error("列表出错: %s", e)
+        logger.error("错误代码: %s, SQL状态: %s", e.errno, e.sqlstate)
         return {"status": "error", "error": str(e)}
 
 
@@ -334,21 +542,34 @@ async def describe_table(database: str, table: str) -> dict:
     Returns:
         表结构信息
     """
-    logger.info(f"查看表结构: {database}.{table}")
+    logger.info("查看表结构: %s.%s", database, table)
+    # 先校验标识符，缓存键中只会出现合法的字符串
     try:
-        conn = get_mysql_connection()
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute(f"USE `{database}`")
-            cursor.execute(f"DESCRIBE `{table}`")
-            result = cursor.fetchall()
-        conn.close()
-        return {"status": "succeed", "structure": result}
+        sql = f"DESCRIBE {_q(database)}.{_q(table)}"
+    except ValueError as e:
+        logger.error("查表结构出错: %s", e)
+        return {"status": "error", "error": str(e)}
+    key = ("describe_table", database, table)
+    cached = _meta_get(key)
+    if cached is not None:
+        return cached
+    try:
+        rows, _ = await asyncio.to_thread(_run_query, sql)
+        result = {"status": "succeed", "structure": rows}
+        _meta_put(key, result)
+        return result
     except Error as e:
-        logger.error(f"查表结构出错: {str(e)}")
-        logger.error(f"错误代码: {e.errno}, SQL状态: {e.sqlstate}")
+        logger.error("查表结构出错: %s", e)
+        logger.error("错误代码: %s, SQL状态: %s", e.errno, e.sqlstate)
         return {"status": "error", "error": str(e)}
 
 
+@functools.lru_cache(maxsize=256)
+def _search_sql(database: str, table: str, column: str) -> str:
+    """生成（并缓存）search_table使用的参数化语句，只有关键字和条数随调用变化"""
+    return f"SELECT * FROM {_q(database)}.{_q(table)} WHERE {_q(column)} LIKE %s LIMIT %s"
+
+
 async def search_table(database: str, table: str, column: str, keyword: str, limit: int = 20) -> dict:
     """
     在指定表的指定字段中搜索包含关键字的数据
@@ -361,98 +582,157 @@ async def search_table(database: str, table: str, column: str, keyword: str, lim
     Returns:
         匹配数据列表
     """
-    logger.info(f"在 {database}.{table}.{column} 搜索: {keyword}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("在 %s.%s.%s 搜索: %s", database, table, column, keyword)
+    # _search_sql带lru_cache，参数在_q校验之前就要哈希，所以先确认都是字符串
+    for name in (database, table, column):
+        if not isinstance(name, str):
+            logger.error("搜索数据出错: 非法的标识符: %r", name)
+            return {"status": "error", "error": f"非法的标识符: {name!r}"}
     try:
-        conn = get_mysql_connection()
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute(f"USE `{database}`")
-            sql = f"SELECT * FROM `{table}` WHERE `{column}` LIKE %s LIMIT %s"
-            cursor.execute(sql, (f"%{keyword}%", limit))
-            result = cursor.fetchall()
-        conn.close()
+        result, _ = await asyncio.to_thread(
+            _run_query, _search_sql(database, table, column), (f"%{keyword}%", limit)
+        )
         return {"status": "succeed", "data": result}
     except Error as e:
-        logger.error(f"搜索数据出错: {str(e)}")
-        logger.error(f"错误代码: {e.errno}, SQL状态: {e.sqlstate}")
+        logger.error("搜索数据出错: %s", e)
+        logger.error("错误代码: %s, SQL状态: %s", e.errno, e.sqlstate)
+        return {"status": "error", "error": str(e)}
+    except ValueError as e:
+        logger.error("搜索数据出错: %s", e)
         return {"status": "error", "error": str(e)}
 
 
+# 初始化选项依赖已注册的处理函数，所以在所有处理函数注册之后构建一次
+_INIT_OPTS = app.create_initialization_options()
+
+
+# 退出时等待仍在执行的数据库调用的最长秒数，超时后不再等待，直接关闭空闲连接
+SHUTDOWN_TIMEOUT = float(os.getenv("MYSQL_SHUTDOWN_TIMEOUT", "5"))
+
+
+# main()创建的数据库工作线程池（也是事件循环的默认执行器）
+_executor = None
+
+
+async def _release_resources():
+    """等待仍在执行的数据库调用结束并归还连接（最多SHUTDOWN_TIMEOUT秒），再关闭连接池"""
+    if _executor is not None:
+        # Python 3.11的shutdown_default_executor没有超时参数，取消时还会阻塞等待线程结束，
+        # 所以在单独的守护线程里关闭线程池，这里只等待有限的时间
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+
+        def notify():
+            if not finished.done():
+                finished.set_result(None)
+
+        def shutdown_workers():
+            _executor.shutdown(wait=True)
+            try:
+                loop.call_soon_threadsafe(notify)
+            except RuntimeError:
+                pass  # 事件循环已经关闭
+
+        threading.Thread(target=shutdown_workers, name="mysql-shutdown", daemon=True).start()
+        try:
+            await asyncio.wait_for(finished, SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("等待数据库调用结束超过 %s 秒，不再等待", SHUTDOWN_TIMEOUT)
+    close_connection_pool()
+
+
 async def main():
     """主入口点，运行MCP服务器"""
+    global _executor
     # 导入stdio_server
     from mcp.server.stdio import stdio_server
 
     try:
         logger.info("启动本地MySQL MCP服务")
 
-        # 测试数据库连接
-        try:
-            conn = get_mysql_connection()
-            logger.info(f"数据库连接测试成功，服务器版本: {conn.get_server_info()}")
-            conn.close()
-        except Exception as e:
-            logger.error(f"数据库连接测试失败: {str(e)}")
-            # 继续执行，因为可能是环境变量未设置
+        # 启动时不单独探测数据库连接：连接池在第一次请求时创建，配置错误会在那时报告
 
         # 打印配置信息到标准错误输出
         config = get_db_config()
-        print("Starting MySQL MCP server with config:", file=sys.stderr)
-        print(f"Host: {config.get('host')}", file=sys.stderr)
-        print(f"Port: {config.get('port')}", file=sys.stderr)
-        print(f"User: {config.get('user')}", file=sys.stderr)
-        print(f"Database: {config.get('database')}", file=sys.stderr)
-        print(f"Charset: {config.get('charset')}", file=sys.stderr)
+        sys.stderr.write(
+            "Starting MySQL MCP server: host=%s port=%s user=%s db=%s charset=%s\n"
+            % (config.get('host'), config.get('port'), config.get('user'),
+               config.get('database'), config.get('charset'))
+        )
 
         logger.info("启动MCP服务...")
 
         # 打印MCP版本信息
         try:
             import mcp
-            logger.info(f"MCP版本: {getattr(mcp, '__version__', '未知')}")
+            logger.info("MCP版本: %s", getattr(mcp, '__version__', '未知'))
         except Exception as e:
-            logger.warning(f"无法获取MCP版本: {str(e)}")
+            logger.warning("无法获取MCP版本: %s", e)
 
         # 显式设置transport参数并添加详细日志
         logger.info("设置MCP运行参数: transport=stdio")
 
-        # 添加信号处理，确保可以正常退出
-        def signal_handler(sig, frame):
-            logger.info(f"收到信号 {sig}，准备退出...")
-            sys.exit(0)
+        loop = asyncio.get_running_loop()
 
-        signal.signal(signal.SIGINT, signal_handler)
-        logger.info("注册信号处理器，按Ctrl+C可正常退出")
+        # SIGINT/SIGTERM只记录收到的信号，由main()关闭连接池后再结束进程，而不是直接sys.exit
+        stop = loop.create_future()
 
-        # 确保输出缓冲区刷新
-        sys.stdout.flush()
-        sys.stderr.flush()
+        def request_stop(sig):
+            if not stop.done():
+                stop.set_result(sig)
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, request_stop, sig)
+            except NotImplementedError:
+                # Windows事件循环不支持add_signal_handler，Ctrl+C仍以KeyboardInterrupt退出
+                pass
+        logger.info("注册信号处理器，按Ctrl+C或发送SIGTERM可正常退出")
+
+        # 数据库调用通过asyncio.to_thread在默认线程池中执行，这里指定线程数
+        workers = int(os.getenv("MYSQL_WORKERS", "16"))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mysql")
+        loop.set_default_executor(_executor)
+        logger.info("数据库工作线程数: %s", workers)
 
         logger.info("MCP服务即将启动并进入监听状态...")
 
         # 使用与server.py相同的方式启动服务
         async with stdio_server() as (read_stream, write_stream):
+            # 使用Server的run方法，与退出信号竞争：任一先完成即开始关闭
+            server = asyncio.create_task(app.run(read_stream, write_stream, _INIT_OPTS))
             try:
-                # 使用Server的run方法
-                await app.run(
-                    read_stream,
-                    write_stream,
-                    app.create_initialization_options()
-                )
-            except Exception as e:
-                logger.error(f"服务器错误: {str(e)}", exc_info=True)
-                raise
+                await asyncio.wait({server, stop}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                server.cancel()
+            if stop.done():
+                # stdio_server的stdin读线程阻塞在readline()上，客户端不关闭stdin时上下文无法退出；
+                # 所以在这里释放资源，然后按信号的默认行为结束进程，不等待传输层结束
+                sig = stop.result()
+                logger.info("收到信号 %s，正在关闭MCP服务...", sig)
+                await _release_resources()
+                logging.shutdown()
+                signal.signal(sig, signal.SIG_DFL)
+                signal.raise_signal(sig)
+            if not server.cancelled() and server.exception() is not None:
+                exc = server.exception()
+                logger.error("服务器错误: %s", exc, exc_info=exc)
+                raise exc
 
     except Exception as e:
-        logger.critical(f"MCP服务启动失败: {str(e)}", exc_info=True)
+        logger.critical("MCP服务启动失败: %s", e, exc_info=True)
         raise
+    finally:
+        await _release_resources()
 
 
 if __name__ == '__main__':
     try:
-        # 使用asyncio.run启动异步主函数
-        asyncio.run(main())
+        # 安装了uvloop时使用uvloop运行异步主函数，否则使用asyncio.run
+        (uvloop.run if uvloop is not None else asyncio.run)(main())
     except KeyboardInterrupt:
         logger.info("收到键盘中断，程序退出")
     except Exception as e:
-        logger.critical(f"MCP服务启动失败: {str(e)}", exc_info=True)
+        logger.critical("MCP服务启动失败: %s", e, exc_info=True)
         sys.exit(1)
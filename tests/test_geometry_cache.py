@@ -0,0 +1,51 @@
+import pytest
+
+import mcp_geometry
+
+
+@pytest.fixture(autouse=True)
+def render_cache(monkeypatch):
+    monkeypatch.setattr(mcp_geometry, "GEOM_CACHE", True)
+    mcp_geometry._cached_render.cache_clear()
+    yield
+    mcp_geometry._cached_render.cache_clear()
+
+
+def test_repeat_call_is_a_cache_hit():
+    first = mcp_geometry._render(mcp_geometry.draw_circle, 0, 0, 1, "svg")
+    second = mcp_geometry._render(mcp_geometry.draw_circle, 0, 0, 1, "svg")
+
+    assert second == first
+    assert mcp_geometry._cached_render.cache_info().hits == 1
+
+
+def test_equivalent_arguments_share_an_entry():
+    first = mcp_geometry._render(mcp_geometry.draw_polygon, [[0, 0], [1, 0], [0, 1]], "svg")
+    second = mcp_geometry._render(mcp_geometry.draw_polygon, ((0, 0), (1, 0), (0, 1)), "svg")
+
+    assert second == first
+    assert mcp_geometry._cached_render.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    "fn, args",
+    [
+        (mcp_geometry.draw_circle, (0, 0, 1e-7, "svg")),
+        (mcp_geometry.draw_line, (0, 0, 3e-7, 4e-7, "svg")),
+        (mcp_geometry.draw_ellipse, (0.5, 0.25, 2.0, 1.0, "png")),
+    ],
+)
+def test_cached_output_matches_uncached_render(fn, args, monkeypatch):
+    cached = mcp_geometry._render(fn, *args)
+    hit = mcp_geometry._render(fn, *args)
+
+    monkeypatch.setattr(mcp_geometry, "GEOM_CACHE", False)
+    assert cached == hit == mcp_geometry._render(fn, *args)
+
+
+def test_small_values_are_not_collapsed_into_one_entry():
+    small = mcp_geometry._render(mcp_geometry.draw_circle, 0, 0, 1e-7, "svg")
+    smaller = mcp_geometry._render(mcp_geometry.draw_circle, 0, 0, 2e-7, "svg")
+
+    assert mcp_geometry._cached_render.cache_info().hits == 0
+    assert small != smaller
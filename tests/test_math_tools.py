@@ -0,0 +1,73 @@
+import math
+
+import pytest
+
+import mcp_math
+
+
+async def call(name, arguments):
+    result = await mcp_math.call_tool(name, arguments)
+    return result[0].text
+
+
+def parse(text):
+    # 结果是dict的str()文本，tan/cot为无穷大时包含inf
+    return eval(text, {"__builtins__": {}}, {"inf": math.inf})
+
+
+async def test_triangle_without_sides_reports_area_only():
+    result = parse(await call("triangle_calc", {"base": 3, "height": 4}))
+
+    assert result == {"area": 6.0, "perimeter": "需要提供三边长才能计算周长"}
+
+
+async def test_triangle_with_sides_reports_perimeter():
+    result = parse(await call("triangle_calc", {"base": 3, "height": 4, "a": 3, "b": 4, "c": 5}))
+
+    assert result == {"area": 6.0, "perimeter": 12.0}
+
+
+async def test_trapezoid_without_legs_derives_them_from_height():
+    result = parse(await call("trapezoid_calc", {"a": 2, "b": 4, "height": 3}))
+
+    assert result["area"] == 9.0
+    assert result["perimeter"] == pytest.approx(6 + 2 * math.sqrt(10))
+
+
+async def test_trapezoid_with_legs_uses_them():
+    result = parse(await call("trapezoid_calc", {"a": 2, "b": 4, "height": 3, "c": 5, "d": 6}))
+
+    assert result == {"area": 9.0, "perimeter": 17.0}
+
+
+async def test_trig_functions_scalar_angle_returns_scalars():
+    result = parse(await call("trig_functions", {"angle": 30}))
+
+    assert set(result) == {"sin", "cos", "tan", "cot"}
+    assert all(isinstance(v, float) for v in result.values())
+    assert result["sin"] == pytest.approx(0.5)
+    assert result["tan"] == pytest.approx(1 / math.sqrt(3))
+
+
+async def test_trig_functions_angle_list_returns_lists():
+    result = parse(await call("trig_functions", {"angle": [0, 30, 90]}))
+
+    assert result["sin"] == pytest.approx([0.0, 0.5, 1.0])
+    assert result["cos"] == pytest.approx([1.0, math.sqrt(3) / 2, 0.0], abs=1e-12)
+    assert result["tan"][0] == 0.0
+    assert result["cot"][0] == math.inf
+
+
+@pytest.mark.parametrize(
+    "name, arguments",
+    [
+        ("circle_calc", {"radius": [1, 2]}),
+        ("ellipse_calc", {"a": [1, 2], "b": 1}),
+        ("triangle_calc", {"base": 3, "height": [4]}),
+        ("trapezoid_calc", {"a": 1, "b": 2, "height": 3, "c": [1], "d": 2}),
+    ],
+)
+async def test_list_arguments_are_rejected_outside_trig_functions(name, arguments):
+    text = await call(name, arguments)
+
+    assert text.startswith("计算出错: float() argument must be")
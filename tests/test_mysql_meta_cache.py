@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import pytest
+
+import mcp_mysql
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(mcp_mysql, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """用假的_run_query代替数据库，记录执行过的SQL"""
+    calls = []
+
+    def fake_run_query(sql, params=None, dictionary=True, max_rows=None):
+        calls.append(sql)
+        if sql == "SHOW DATABASES":
+            return [{"Database": "db"}], 1
+        if sql == mcp_mysql._LIST_TABLES_SQL:
+            return [("t",)], 1
+        if sql.startswith("DESCRIBE"):
+            return [{"Field": "id"}], 1
+        return None, 1
+
+    monkeypatch.setattr(mcp_mysql, "_run_query", fake_run_query)
+    monkeypatch.setattr(mcp_mysql, "META_TTL", 30.0)
+    mcp_mysql._meta_cache.clear()
+    yield calls
+    mcp_mysql._meta_cache.clear()
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda: mcp_mysql.list_databases(),
+        lambda: mcp_mysql.list_tables("db"),
+        lambda: mcp_mysql.describe_table("db", "t"),
+    ],
+)
+async def test_repeat_call_is_served_from_cache(call, queries, clock):
+    first = await call()
+    second = await call()
+
+    assert first["status"] == "succeed"
+    assert second == first
+    assert len(queries) == 1
+
+
+async def test_entry_expires_after_ttl(queries, clock):
+    await mcp_mysql.list_tables("db")
+    clock[0] += 29
+    await mcp_mysql.list_tables("db")
+    assert len(queries) == 1
+
+    clock[0] += 2
+    await mcp_mysql.list_tables("db")
+    assert len(queries) == 2
+
+
+async def test_cache_is_keyed_by_arguments(queries, clock):
+    await mcp_mysql.describe_table("db", "t")
+    await mcp_mysql.describe_table("db", "u")
+
+    assert len(queries) == 2
+
+
+async def test_statement_without_result_set_clears_cache(queries, clock):
+    await mcp_mysql.list_tables("db")
+    result = await mcp_mysql.query_mysql("CREATE TABLE u (id INT)")
+    await mcp_mysql.list_tables("db")
+
+    assert result == {"status": "succeed", "affected_rows": 1}
+    assert queries.count(mcp_mysql._LIST_TABLES_SQL) == 2
+
+
+async def test_zero_ttl_disables_cache(queries, clock, monkeypatch):
+    monkeypatch.setattr(mcp_mysql, "META_TTL", 0.0)
+    await mcp_mysql.list_databases()
+    await mcp_mysql.list_databases()
+
+    assert len(queries) == 2
+    assert mcp_mysql._meta_cache == {}
+
+
+async def test_errors_are_not_cached(queries, clock, monkeypatch):
+    def failing_run_query(sql, params=None, dictionary=True, max_rows=None):
+        queries.append(sql)
+        raise mcp_mysql.Error("gone away")
+
+    monkeypatch.setattr(mcp_mysql, "_run_query", failing_run_query)
+    assert (await mcp_mysql.list_databases())["status"] == "error"
+    assert (await mcp_mysql.list_databases())["status"] == "error"
+
+    assert len(queries) == 2
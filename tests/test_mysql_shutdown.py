@@ -0,0 +1,73 @@
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "mcp_mysql.py"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX signals only")
+@pytest.mark.parametrize("sig", [signal.SIGTERM, signal.SIGINT])
+def test_signal_exits_while_stdin_is_open(sig):
+    """客户端保持stdin打开时，SIGTERM/SIGINT也应立即结束进程"""
+    env = dict(os.environ, LOG_LEVEL="INFO", MYSQL_HOST="127.0.0.1", MYSQL_PORT="1")
+    proc = subprocess.Popen(
+        [sys.executable, str(SCRIPT)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        text=True,
+    )
+    try:
+        # 等到信号处理器注册完成、服务进入监听状态
+        for line in proc.stderr:
+            if "MCP服务即将启动并进入监听状态" in line:
+                break
+        else:
+            pytest.fail("MCP服务没有启动")
+
+        proc.send_signal(sig)
+        returncode = proc.wait(timeout=3)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdin.close()
+        proc.stdout.close()
+        proc.stderr.close()
+
+    assert returncode == -sig
+
+
+async def test_release_resources_does_not_wait_for_long_queries(monkeypatch):
+    """执行中的长查询不能让退出无限等待；超时后仍然关闭连接池"""
+    import asyncio
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    import mcp_mysql
+
+    closed = []
+    monkeypatch.setattr(mcp_mysql, "SHUTDOWN_TIMEOUT", 0.2)
+    monkeypatch.setattr(mcp_mysql, "close_connection_pool", lambda: closed.append(True))
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(mcp_mysql, "_executor", executor)
+    asyncio.get_running_loop().set_default_executor(executor)
+    release = threading.Event()
+    query = asyncio.ensure_future(asyncio.to_thread(release.wait, 10))
+    await asyncio.sleep(0)
+
+    started = time.monotonic()
+    await mcp_mysql._release_resources()
+    elapsed = time.monotonic() - started
+
+    release.set()
+    await query
+    assert elapsed < 2
+    assert closed == [True]
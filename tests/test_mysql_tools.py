@@ -0,0 +1,98 @@
+import pytest
+
+import mcp_mysql
+
+
+@pytest.mark.parametrize("max_rows", [None, "abc", "10", -1, 1.5, True])
+async def test_query_rejects_invalid_max_rows(max_rows, monkeypatch):
+    calls = []
+
+    async def fake_query(sql, max_rows):
+        calls.append(max_rows)
+        return {"status": "succeed", "data": []}
+
+    monkeypatch.setattr(mcp_mysql, "query_mysql", fake_query)
+    result = await mcp_mysql.call_tool("query_mysql", {"sql": "SELECT 1", "max_rows": max_rows})
+
+    if max_rows is None:
+        assert calls == [mcp_mysql.DEFAULT_MAX_ROWS]
+    else:
+        assert calls == []
+        assert result[0].text == "max_rows必须是非负整数"
+
+
+async def test_query_passes_max_rows(monkeypatch):
+    calls = []
+
+    async def fake_query(sql, max_rows):
+        calls.append(max_rows)
+        return {"status": "succeed", "data": []}
+
+    monkeypatch.setattr(mcp_mysql, "query_mysql", fake_query)
+    await mcp_mysql.call_tool("query_mysql", {"sql": "SELECT 1", "max_rows": 0})
+    await mcp_mysql.call_tool("query_mysql", {"sql": "SELECT 1"})
+
+    assert calls == [0, mcp_mysql.DEFAULT_MAX_ROWS]
+
+
+@pytest.mark.parametrize("name", ["t$1", "用户表", "a" * 64])
+def test_q_quotes_valid_identifiers(name):
+    assert mcp_mysql._q(name) == f"`{name}`"
+
+
+@pytest.mark.parametrize("name", ["a`b", "t\n", "", "a" * 65, 5, None])
+def test_q_rejects_invalid_identifiers(name):
+    with pytest.raises(ValueError):
+        mcp_mysql._q(name)
+
+
+async def test_describe_table_reports_invalid_identifier():
+    result = await mcp_mysql.describe_table(5, "t")
+    assert result["status"] == "error"
+
+
+async def test_search_table_reports_invalid_identifier():
+    result = await mcp_mysql.search_table("db", "t", 5, "k")
+    assert result["status"] == "error"
+
+
+@pytest.mark.parametrize(
+    "name, arguments",
+    [
+        ("list_tables", {"database": ["a"]}),
+        ("describe_table", {"database": "d", "table": ["t"]}),
+        ("describe_table", {"database": ["d"], "table": "t"}),
+    ],
+)
+async def test_metadata_tools_report_unhashable_arguments(name, arguments):
+    result = await mcp_mysql.call_tool(name, arguments)
+    assert '"status":"error"' in result[0].text
+
+
+@pytest.mark.parametrize("field", ["database", "table", "column"])
+async def test_search_table_reports_unhashable_identifier(field):
+    arguments = {"database": "d", "table": "t", "column": "c", "keyword": "k", field: ["x"]}
+    result = await mcp_mysql.call_tool("search_table", arguments)
+    assert '"status":"error"' in result[0].text
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, 10), ("5", 5), ("0", 1), ("-3", 1), ("33", 32), ("100", 32), ("abc", 10)],
+)
+def test_pool_size_is_clamped_to_connector_range(value, expected, monkeypatch):
+    if value is None:
+        monkeypatch.delenv("MYSQL_POOL_SIZE", raising=False)
+    else:
+        monkeypatch.setenv("MYSQL_POOL_SIZE", value)
+    assert mcp_mysql._pool_size() == expected
+
+
+def test_encode_keeps_binary_values_lossless():
+    import orjson
+
+    payload = {"text": "名字".encode(), "blob": b"\x00\xff\xfe", "buf": bytearray(b"\x89PNG")}
+    decoded = orjson.loads(mcp_mysql._encode(payload))
+
+    assert decoded == {"text": "名字", "blob": "0x00fffe", "buf": "0x89504e47"}
+    assert bytes.fromhex(decoded["blob"][2:]) == payload["blob"]